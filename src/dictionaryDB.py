@@ -14,28 +14,141 @@ Features
 import sqlite3
 import traceback
 import time
+import functools
+import itertools
 from typing import Callable, Dict, Any, Tuple
 import threading
 
-__all__ = ['writeDB', 'readDB', 'archiveDB']  # Specify the functions to be exported
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+try:
+    from numba import njit
+    _HAS_NUMBA = _HAS_NUMPY
+except ImportError:
+    _HAS_NUMBA = False
+
+# Below this many cumulative fields, building NumPy arrays costs more than
+# the scalar loop it replaces
+_NUMPY_MIN_FIELDS = 16
+
+if _HAS_NUMBA:
+    @njit(cache=True, boundscheck=False)
+    def _cum_kernel(cur, off, old):
+        """Reset detection and accumulation as one tight compiled loop;
+        off is rebaselined in place when a reset is found."""
+        reset = False
+        for i in range(cur.shape[0]):
+            if cur[i] + off[i] < old[i]:
+                reset = True
+                break
+        if reset:
+            for i in range(off.shape[0]):
+                off[i] = old[i]
+        return cur + off, reset
+
+__all__ = ['writeDB', 'writeDBMany', 'readDB', 'iterDB', 'archiveDB']  # Specify the functions to be exported
+
+# Set True to print full tracebacks for caught database errors; the short
+# one-line message is always printed
+DEBUG = False
+
+# Maximum bound parameters per statement (SQLITE_MAX_VARIABLE_NUMBER
+# was raised from 999 to 32766 in SQLite 3.32)
+SQLITE_MAX_VARS = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+# INSERT ... RETURNING arrived in SQLite 3.35
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
 
-# Cache for database connections
-db_connection_cache: Dict[tuple[str, int], sqlite3.Connection] = {}
+# Per-thread cache of database connections, keyed by (dbFileName, readonly)
+_tls = threading.local()
 
 # Cache for table schemas
 schema_cache: Dict[str, Dict[str, list]] = {}
 
+# Cache of the most recently inserted row per (dbFileName, dbTable), so
+# cumulative writes can skip re-reading their own last insert
+last_row_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+# Column sets known to exist per (dbFileName, dbTable); writes whose keys
+# are covered can skip schema initialization entirely
+known_shapes: Dict[Tuple[str, str], frozenset] = {}
+
+# Precomputed '?, ?, ...' strings for common widths, so SQL builders skip
+# the per-call join
+_PLACEHOLDERS = [', '.join('?' * n) for n in range(65)]
+
+def _placeholders(n: int) -> str:
+    """Return a string of n comma-separated '?' placeholders."""
+    return _PLACEHOLDERS[n] if n < len(_PLACEHOLDERS) else ', '.join('?' * n)
+
+@functools.lru_cache(maxsize=1024)
+def _q(ident: str) -> str:
+    """
+    Validate and double-quote an identifier (table or column name).
+
+    Identifiers can't be bound as parameters, so anything interpolated into
+    SQL text goes through here: names are restricted to alphanumerics and
+    underscores, and the quoting keeps reserved words usable. The cache
+    means each name is validated once.
+    """
+    if not ident.replace('_', '').isalnum():
+        raise ValueError(f"Invalid SQL identifier: {ident!r}")
+    return '"' + ident + '"'
+
+@functools.lru_cache(maxsize=256)
+def _columns_str(cols: tuple) -> str:
+    """Quote and join a column tuple once and reuse the result."""
+    return ', '.join(_q(col) for col in cols)
+
+@functools.lru_cache(maxsize=256)
+def _insert_sql(table: str, cols: tuple, nrows: int = 1, returning: bool = False) -> str:
+    """Build and cache the INSERT statement for a column set; identical SQL
+    text also lets sqlite3 reuse its compiled-statement cache."""
+    columns = _columns_str(cols)
+    row_placeholders = '(' + _placeholders(len(cols)) + ')'
+    values_clause = ', '.join([row_placeholders] * nrows)
+    sql = f"INSERT INTO {_q(table)} ({columns}) VALUES {values_clause}"
+    if returning:
+        sql += " RETURNING *"
+    return sql
+
+@functools.lru_cache(maxsize=256)
+def _upsert_sql(table: str, cols: tuple) -> str:
+    """Build and cache the single-row UPSERT that keeps an offsets table's
+    row 1 current: insert it, or overwrite it if it already exists."""
+    columns = _columns_str(cols)
+    assignments = ', '.join(f"{_q(col)} = excluded.{_q(col)}" for col in cols)
+    return (f"INSERT INTO {_q(table)} (id, {columns}) VALUES (1, {_placeholders(len(cols))}) "
+            f"ON CONFLICT(id) DO UPDATE SET {assignments}")
+
+@functools.lru_cache(maxsize=256)
+def _select_sql(table: str, fields: tuple, whereClause: str, limit: int, orderBy: str) -> str:
+    """Build and cache the SELECT statement for a query shape."""
+    query = f"SELECT {_columns_str(fields)} FROM {_q(table)}"
+    if whereClause:
+        query += f" WHERE {whereClause}"
+    if orderBy:
+        query += f" ORDER BY {orderBy}"
+    if limit and limit > 0:
+        query += f" LIMIT {limit}"
+    return query
+
 def readDB(dbFileName: str, 
     dbTable: str,
     limit: int = 1,
     orderBy: str = None,
     whereClause: str = None,
     fields: list = None,
-    include_id: bool = False
+    include_id: bool = False,
+    as_columns: bool = False
 ) -> list:
     """
     Read records from dbTable of dbFileName.
-    
+
     Parameters:
         dbFileName: The name of the database file.
         dbTable: The name of the table to read from.
@@ -44,12 +157,14 @@ def readDB(dbFileName: str,
         whereClause: Optional WHERE clause (e.g., "FIELDNAME = 'value'").
         fields: Optional list of fields to return; if None, return all fields.
         include_id: Optional boolean to specify if the 'id' field should be included (default is False).
-    
+        as_columns: Optional boolean to return one list per column instead of one dictionary per record (default is False).
+
     Returns:
-        A list of dictionaries representing the records.
+        A list of dictionaries representing the records, or a dictionary of
+        column lists when as_columns is True.
     """
     # Check if the database connection is already cached
-    conn = get_conn(dbFileName)
+    conn = get_conn(dbFileName, readonly=True)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -59,22 +174,12 @@ def readDB(dbFileName: str,
             fields = get_table_schema(dbFileName, dbTable)
 
         # If include_id is False, remove 'id' from the fields if it exists
+        # (rebuild rather than remove, so the cached schema list stays intact)
         if not include_id and 'id' in fields:
-            fields.remove('id')
-
-        fields_str = ', '.join(fields)
-
-        query = f"SELECT {fields_str} FROM {dbTable}"
-        
-        if whereClause:
-            query += f" WHERE {whereClause}"
-        
-        if limit:
-            if limit > 0:
-                query += f" LIMIT {limit}"
+            fields = [field for field in fields if field != 'id']
 
-        if orderBy:
-            query += f" ORDER BY {orderBy}"
+        # Repeated reads with the same shape reuse the memoized SQL text
+        query = _select_sql(dbTable, tuple(fields), whereClause, limit, orderBy)
 
         # Execute the query
         #print(f"sqlite3 query:{query}")
@@ -82,17 +187,24 @@ def readDB(dbFileName: str,
         
         # Fetch the results
         records = cursor.fetchall()
-        
-        # Directly use the Row objects to create a list of dictionaries
-        if records:
-            result = [dict(record) for record in records]
-            return result
-        else:
+
+        if not records:
             return None
 
-    except Exception as e:
+        # Columnar form: zip(*rows) is a single C-level transpose, with no
+        # per-row dict allocation or key hashing
+        if as_columns:
+            col_names = [description[0] for description in cursor.description]
+            return {name: list(values) for name, values in zip(col_names, zip(*records))}
+
+        # Directly use the Row objects to create a list of dictionaries
+        result = [dict(record) for record in records]
+        return result
+
+    except (sqlite3.IntegrityError, sqlite3.OperationalError) as e:
         print(f"Error occurred while reading data: {e}")
-        traceback.print_exc()
+        if DEBUG:
+            traceback.print_exc()
         return []
 
     finally:
@@ -100,6 +212,67 @@ def readDB(dbFileName: str,
         cursor.close()
 
 
+def iterDB(dbFileName: str,
+    dbTable: str,
+    limit: int = 0,
+    orderBy: str = None,
+    whereClause: str = None,
+    fields: list = None,
+    include_id: bool = False
+):
+    """
+    Iterate over records from dbTable of dbFileName.
+
+    Streaming counterpart to readDB: rows are fetched in batches of
+    cursor.arraysize and yielded one dictionary at a time, so large results
+    are never held in memory all at once.
+
+    Parameters:
+        dbFileName: The name of the database file.
+        dbTable: The name of the table to read from.
+        limit: The maximum number of records to yield (default is 0, no limit).
+        orderBy: Optional ORDER BY clause (e.g., "id DESC").
+        whereClause: Optional WHERE clause (e.g., "FIELDNAME = 'value'").
+        fields: Optional list of fields to return; if None, return all fields.
+        include_id: Optional boolean to specify if the 'id' field should be included (default is False).
+
+    Yields:
+        Dictionaries representing the records.
+    """
+    conn = get_conn(dbFileName, readonly=True)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+
+    try:
+        # Get the schema for the specified table
+        if fields is None:
+            fields = get_table_schema(dbFileName, dbTable)
+
+        # If include_id is False, remove 'id' from the fields if it exists
+        # (rebuild rather than remove, so the cached schema list stays intact)
+        if not include_id and 'id' in fields:
+            fields = [field for field in fields if field != 'id']
+
+        query = _select_sql(dbTable, tuple(fields), whereClause, limit, orderBy)
+        cursor.execute(query)
+
+        cursor.arraysize = 1000
+        while True:
+            batch = cursor.fetchmany()
+            if not batch:
+                break
+            yield from (dict(record) for record in batch)
+
+    except (sqlite3.IntegrityError, sqlite3.OperationalError) as e:
+        print(f"Error occurred while reading data: {e}")
+        if DEBUG:
+            traceback.print_exc()
+
+    finally:
+        # Optionally close the cursor if needed
+        cursor.close()
+
+
 def writeDB(dbFileName: str,
     dbTable: str,
     data: Any,
@@ -117,81 +290,174 @@ def writeDB(dbFileName: str,
         cumulative_fields: List of fields to accumulate regardless of resets; defaults to None.
 
     """
+    # Simple writes go through the batched path with a single-element list
+    if cumulative_fields is None:
+        writeDBMany(dbFileName, dbTable, [data], timestamp_field)
+        return
+
     # Add the current Unix timestamp to the data dictionary
     if timestamp_field is not None:
         data[timestamp_field] = int(time.time())  # Store timestamp as Unix time
 
-    # Get database connection
+    # Get database connection and the thread's reusable write cursor
     conn = get_conn(dbFileName)
-    cursor = conn.cursor()
+    cursor = _write_cursor(dbFileName)
 
     try:
         # Initialize the database and create the main table if it doesn't exist
-        initialize_database(dbFileName, dbTable, data)
-
-        # Insert the data into the database
-        if cumulative_fields is not None:
-            # Initialize/create the offsets table
-            offsets_table = dbTable + "offsets"
-            initialize_database(dbFileName, offsets_table, data)
-
-            # Fetch the last values from the data table (old totals)
-            cursor.execute(f"SELECT * FROM {dbTable} WHERE id = (SELECT MAX(id) FROM {dbTable})")
+        _ensure_shape(dbFileName, dbTable, data)
+
+        # Initialize/create the offsets table
+        offsets_table = dbTable + "offsets"
+        _ensure_shape(dbFileName, offsets_table, data)
+
+        # Fetch the last values from the data table (old totals),
+        # preferring the in-process cache over hitting the database;
+        # ORDER BY id DESC LIMIT 1 walks the rowid btree directly
+        # instead of scanning for MAX(id)
+        old_totals = last_row_cache.get((dbFileName, dbTable))
+        if old_totals is None:
+            cursor.execute(f"SELECT * FROM {_q(dbTable)} ORDER BY id DESC LIMIT 1")
             old_row = cursor.fetchone()
             if old_row is None:
                 old_totals = {key: 0 for key in data.keys()}  # Default to 0 for all keys
             else:
                 old_totals = dict(old_row)
 
-            # Fetch the last values from the offsets table
-            cursor.execute(f"SELECT * FROM {offsets_table} WHERE id = (SELECT MAX(id) FROM {offsets_table})")
+        # Fetch the last values from the offsets table
+        offsets = last_row_cache.get((dbFileName, offsets_table))
+        if offsets is None:
+            cursor.execute(f"SELECT * FROM {_q(offsets_table)} ORDER BY id DESC LIMIT 1")
             offset_row = cursor.fetchone()
             if offset_row is None:
                 offsets = {key: 0 for key in data.keys()}  # Default to 0 for all keys
             else:
                 offsets = dict(offset_row)
 
-            # Call the cumulative calculation function
-            new_totals, reset_detected, offsets = calculate_cumulative_data(data, offsets, old_totals, 
-                                                                           timestamp_field, cumulative_fields)
-
-            # Start a transaction if cumulative is True
-            cursor.execute("BEGIN TRANSACTION;")
+        # A field first seen on this write has no history: treat its missing
+        # (or NULL, for freshly added columns) totals and offsets as 0
+        for key in data.keys():
+            if old_totals.get(key) is None:
+                old_totals[key] = 0
+            if offsets.get(key) is None:
+                offsets[key] = 0
+
+        # Call the cumulative calculation function
+        new_totals, reset_detected, offsets = calculate_cumulative_data(data, offsets, old_totals,
+                                                                       timestamp_field, cumulative_fields)
+
+        # Prepare the data to insert
+        data.update(new_totals)
+
+        # The connection context manager commits the group atomically on
+        # success and rolls back in C if anything inside raises — no manual
+        # BEGIN/commit/rollback round-trips
+        with conn:
             if reset_detected:
-                # Prepare the SQL for inserting a new row
-                columns = ', '.join(offsets.keys())
-                placeholders = ', '.join('?' for _ in offsets)
+                # One UPSERT replaces the old INSERT OR IGNORE + UPDATE pair:
+                # a single statement inserts the offsets row or overwrites it
+                # in place (the old unqualified UPDATE rewrote every row)
+                offset_cols = tuple(sorted(key for key in offsets.keys() if key != 'id'))
+                cursor.execute(_upsert_sql(offsets_table, offset_cols),
+                               tuple(offsets[col] for col in offset_cols))
+
+            # Insert the main data into the database; sorted column order keeps
+            # the SQL text identical regardless of dict key order. RETURNING
+            # hands back the stored row (id, defaulted columns and all) from
+            # the same statement, so the cache matches what a re-SELECT would
+            # see without a second round-trip.
+            cols = tuple(sorted(data.keys()))
+            values = tuple(data[col] for col in cols)
+            if _HAS_RETURNING:
+                cursor.execute(_insert_sql(dbTable, cols, returning=True), values)
+                inserted_row = dict(cursor.fetchone())
+            else:
+                cursor.execute(_insert_sql(dbTable, cols), values)
+                inserted_row = dict(data)
+
+        # Remember what we just wrote so the next cumulative write
+        # skips both SELECTs
+        last_row_cache[(dbFileName, dbTable)] = inserted_row
+        last_row_cache[(dbFileName, offsets_table)] = dict(offsets)
+    except (sqlite3.IntegrityError, sqlite3.OperationalError) as e:
+        # Drop potentially stale cache entries after a rollback
+        last_row_cache.pop((dbFileName, dbTable), None)
+        last_row_cache.pop((dbFileName, offsets_table), None)
+        print(f"Error occurred while inserting data: {e}")
+        if DEBUG:
+            traceback.print_exc()
 
-                # Attempt to insert a new row, ignoring if it already exists
-                cursor.execute(f"INSERT OR IGNORE INTO {offsets_table} ({columns}) VALUES ({placeholders})", tuple(offsets.values()))
+def writeDBMany(dbFileName: str,
+    dbTable: str,
+    rows: list,
+    timestamp_field: str = None
+) -> None:
+    """
+    Write a list of records to dbTable of dbFileName in a single transaction.
 
-                # Now update the existing row with the new values
-                cursor.execute(f"UPDATE {offsets_table} SET " + ', '.join(f"{key} = ?" for key in offsets.keys()), tuple(offsets.values()))
+    One commit covers all rows, so inserting N records costs one disk sync
+    instead of N. Fields missing from an individual row are stored as NULL.
 
-            # Prepare the data to insert
-            data.update(new_totals)
+    Parameters:
+        dbFileName: The name of the database file.
+        dbTable: The name of the table to write to.
+        rows: List of dictionaries representing the records.
+        timestamp_field: Optional field name for storing the timestamp.
+    """
+    if not rows:
+        return
 
-        # Insert the main data into the database
-        columns = ', '.join(data.keys())
-        placeholders = ', '.join('?' * len(data))
-        values = tuple(data.values())
-        
-        cursor.execute(f"INSERT INTO {dbTable} ({columns}) VALUES ({placeholders})", values)
+    # Add the current Unix timestamp to every row
+    if timestamp_field is not None:
+        now = int(time.time())
+        for row in rows:
+            row[timestamp_field] = now
 
-        if cumulative_fields is not None:
-            cursor.connection.commit()
-        else:
-            conn.commit()
-    except Exception as e:
-        if cumulative_fields is not None:
-            # Rollback in case of error if cumulative is True
-            cursor.connection.rollback()
-        print(f"Error occurred while inserting data: {e}")
-        traceback.print_exc()
+    # Get database connection and the thread's reusable write cursor
+    conn = get_conn(dbFileName)
+    cursor = _write_cursor(dbFileName)
 
-    finally:
-        # Optionally close the cursor if needed
-        cursor.close()
+    try:
+        # Initialize once using the union of keys across all rows
+        all_fields = {}
+        for row in rows:
+            all_fields.update(row)
+
+        # Nothing to insert if every row is empty; bail out before the
+        # packing math divides by the zero-width column set
+        if not all_fields:
+            print("Error occurred while inserting data: rows contain no fields")
+            return
+
+        _ensure_shape(dbFileName, dbTable, all_fields)
+
+        # Sorted column order keeps the SQL text identical regardless of
+        # dict key order
+        cols = tuple(sorted(all_fields.keys()))
+
+        # Pack as many rows as the bound-parameter limit allows into each
+        # multi-row VALUES statement, so one statement dispatch covers many
+        # rows instead of one
+        rows_per_stmt = max(1, SQLITE_MAX_VARS // len(cols))
+
+        # Take the write lock up front and commit once at the end; the
+        # context manager rolls back on any exception, sqlite3 or not, so a
+        # failed batch can't leave the cached connection mid-transaction
+        with conn:
+            cursor.execute("BEGIN IMMEDIATE")
+            for start in range(0, len(rows), rows_per_stmt):
+                chunk = rows[start:start + rows_per_stmt]
+                params = list(itertools.chain.from_iterable(
+                    (row.get(col) for col in cols) for row in chunk))
+                cursor.execute(_insert_sql(dbTable, cols, len(chunk)), params)
+        # Keep the last-row cache accurate in case this table also takes
+        # cumulative writes
+        last_row_cache[(dbFileName, dbTable)] = {col: rows[-1].get(col) for col in cols}
+    except (sqlite3.IntegrityError, sqlite3.OperationalError) as e:
+        last_row_cache.pop((dbFileName, dbTable), None)
+        print(f"Error occurred while inserting data: {e}")
+        if DEBUG:
+            traceback.print_exc()
 
 def calculate_cumulative_data(
     current_data: Dict[str, Any], 
@@ -219,6 +485,36 @@ def calculate_cumulative_data(
     if cumulative_fields is None:
         cumulative_fields = current_data.keys()
 
+    # Wide integer counter sets (e.g. per-interface network counters) take a
+    # vectorized path: one array compare and one array add instead of a
+    # per-key Python loop
+    fields = list(cumulative_fields)
+    if (_HAS_NUMPY and len(fields) >= _NUMPY_MIN_FIELDS
+            and all(k != timestamp_field
+                    and isinstance(current_data.get(k), int)
+                    and isinstance(offsets.get(k), int)
+                    and isinstance(old_totals.get(k), int)
+                    for k in fields)):
+        cur = np.fromiter((current_data[k] for k in fields), dtype=np.int64, count=len(fields))
+        off = np.fromiter((offsets[k] for k in fields), dtype=np.int64, count=len(fields))
+        old = np.fromiter((old_totals[k] for k in fields), dtype=np.int64, count=len(fields))
+        if _HAS_NUMBA:
+            # The JIT kernel fuses detection and accumulation into one pass
+            # with no intermediate arrays
+            new, reset_detected = _cum_kernel(cur, off, old)
+            reset_detected = bool(reset_detected)
+            if reset_detected:
+                offsets.update(zip(fields, off.tolist()))
+            new_totals = dict(zip(fields, new.tolist()))
+            return new_totals, reset_detected, offsets
+        reset_detected = bool(((cur + off) < old).any())
+        if reset_detected:
+            # Current running totals become the new baseline
+            off = old
+            offsets.update(zip(fields, old.tolist()))
+        new_totals = dict(zip(fields, (cur + off).tolist()))
+        return new_totals, reset_detected, offsets
+
     # Check for potential reset by comparing current values with previous running totals
     reset_detected = False
 #    print(f"old_totals:{old_totals}")
@@ -260,58 +556,103 @@ def archiveDB(
     if records_to_keep is None:
         return  # Exit if no records_to_keep specified
 
-    # Connect to the main and archive databases
+    # Connect to the main database
     conn_main = get_conn(dbFileName)
-    conn_archive = get_conn(archiveFileName)
-    
     cursor_main = conn_main.cursor()
-    cursor_archive = conn_archive.cursor()
 
-    # Start a transaction
     try:
-        conn_main.execute("BEGIN TRANSACTION;")
-        conn_archive.execute("BEGIN TRANSACTION;")
-
         # Get count of records in the main database
-        cursor_main.execute(f'SELECT COUNT(*) FROM {dbTable}')
+        cursor_main.execute(f'SELECT COUNT(*) FROM {_q(dbTable)}')
         record_count = cursor_main.fetchone()[0]
 
         # If record count exceeds the specified limit, move excess records to archive
         if record_count > records_to_keep:
-            print(f"Archiving old records: Moving {record_count - records_to_keep} records to archive. Total records before: {record_count}")
+            records_to_move = record_count - records_to_keep
+            print(f"Archiving old records: Moving {records_to_move} records to archive. Total records before: {record_count}")
 
-            # Select records to archive in ID order
-            cursor_main.execute(f'SELECT * FROM {dbTable} ORDER BY id ASC LIMIT ?', (record_count - records_to_keep,))
-            records = cursor_main.fetchall()
-            old_records = [dict(record) for record in records]
-
-            # Fetch column names from the cursor description
-            column_names = [description[0] for description in cursor_main.description]
-
-            # Create a schema dictionary based on the column names
+            # Make sure the archive table exists with the same columns
+            column_names = get_table_schema(dbFileName, dbTable)
             schema = {column_name: None for column_name in column_names}  # You can specify actual types if known
-
-            # Initialize the database and create the table if it doesn't exist
-            initialize_database(archiveFileName, dbTable, schema)  # Ensure archive table is also initialized
-            for record in old_records:
-                # Prepare the values for the INSERT statement, excluding the 'id'
-                values_to_insert = [record[column_name] for column_name in column_names[1:]]
-                placeholders = ', '.join(['?'] * len(values_to_insert))  # Create placeholders for the values
-                cursor_archive.execute(f'INSERT INTO {dbTable} ({", ".join(column_names[1:])}) VALUES ({placeholders})', values_to_insert)
-                cursor_main.execute(f'DELETE FROM {dbTable} WHERE id = ?', (record['id'],))  # Use 'id' key to delete
-
-            # Commit the changes to both databases
-            conn_main.commit()
-            conn_archive.commit()
+            initialize_database(archiveFileName, dbTable, schema)
+
+            # Find the highest id that should be archived
+            cursor_main.execute(f'SELECT id FROM {_q(dbTable)} ORDER BY id LIMIT 1 OFFSET ?',
+                                (records_to_move - 1,))
+            cutoff_id = cursor_main.fetchone()[0]
+
+            # Move the rows entirely inside SQLite: one INSERT...SELECT plus
+            # one DELETE instead of one INSERT and one DELETE per record
+            columns = _columns_str(tuple(column_names))
+            try:
+                cursor_main.execute("ATTACH DATABASE ? AS arch", (archiveFileName,))
+            except sqlite3.OperationalError:
+                # ATTACH can be unavailable (attached-database limit, file
+                # permissions); fall back to batched cross-connection copies
+                _archive_rows_fallback(dbFileName, dbTable, archiveFileName,
+                                       cutoff_id, column_names)
+            else:
+                try:
+                    cursor_main.execute("BEGIN IMMEDIATE")
+                    cursor_main.execute(f'INSERT INTO arch.{_q(dbTable)} ({columns}) '
+                                        f'SELECT {columns} FROM main.{_q(dbTable)} WHERE id <= ?',
+                                        (cutoff_id,))
+                    cursor_main.execute(f'DELETE FROM main.{_q(dbTable)} WHERE id <= ?', (cutoff_id,))
+                    conn_main.commit()
+                except Exception:
+                    conn_main.rollback()
+                    raise
+                finally:
+                    # ATTACH is per-connection state and the connection is
+                    # cached, so always detach before returning
+                    cursor_main.execute("DETACH DATABASE arch")
         else:
             print("No records to archive.")
 
     except Exception as e:
-        # Rollback in case of error
-        conn_main.rollback()
-        conn_archive.rollback()
         print(f"Error processing old records: {e}")
-        traceback.print_exc()
+        if DEBUG:
+            traceback.print_exc()
+
+    finally:
+        # Close the cursor
+        cursor_main.close()
+
+def _archive_rows_fallback(dbFileName: str, dbTable: str, archiveFileName: str,
+                           cutoff_id: int, column_names: list) -> None:
+    """
+    Archive rows through two connections when ATTACH is unavailable.
+
+    Still batched: one SELECT, one executemany INSERT into the archive and
+    one ranged DELETE from the main table, each inside a single transaction.
+    """
+    conn_main = get_conn(dbFileName)
+    conn_archive = get_conn(archiveFileName)
+    cursor_main = conn_main.cursor()
+    cursor_archive = conn_archive.cursor()
+
+    try:
+        columns = _columns_str(tuple(column_names))
+        cursor_main.execute(f'SELECT {columns} FROM {_q(dbTable)} WHERE id <= ? ORDER BY id',
+                            (cutoff_id,))
+
+        # Stream the slice in fetchmany batches so it's never fully in RAM
+        cursor_main.arraysize = 1000
+        insert_sql = _insert_sql(dbTable, tuple(column_names))
+        cursor_archive.execute("BEGIN IMMEDIATE")
+        while True:
+            batch = cursor_main.fetchmany()
+            if not batch:
+                break
+            cursor_archive.executemany(insert_sql, (tuple(record) for record in batch))
+        conn_archive.commit()
+
+        cursor_main.execute("BEGIN IMMEDIATE")
+        cursor_main.execute(f'DELETE FROM {_q(dbTable)} WHERE id <= ?', (cutoff_id,))
+        conn_main.commit()
+    except Exception:
+        conn_archive.rollback()
+        conn_main.rollback()
+        raise
 
     finally:
         # Close the cursors
@@ -325,7 +666,7 @@ def initialize_database(dbFileName: str, dbTable: str, data: Dict[str, Any]) ->
     
     # Create a table with an auto-incrementing ID if it doesn't exist
     cursor.execute(f'''
-        CREATE TABLE IF NOT EXISTS {dbTable} (
+        CREATE TABLE IF NOT EXISTS {_q(dbTable)} (
             id INTEGER PRIMARY KEY AUTOINCREMENT
         )
     ''')
@@ -333,17 +674,67 @@ def initialize_database(dbFileName: str, dbTable: str, data: Dict[str, Any]) ->
     # Update the schema based on the incoming data
     update_schema(dbFileName, dbTable, data)
 
-def get_conn(dbFileName: str) -> sqlite3.Connection:
-    """Get cached connection from database filename and thread ID, opens db if needed."""
-    thread_id = threading.get_ident()
-    cache_key = (dbFileName, thread_id)
-    conn = db_connection_cache.get(cache_key)
+    # Remember the full column set so later writes with a known shape can
+    # skip initialization
+    known_shapes[(dbFileName, dbTable)] = frozenset(get_table_schema(dbFileName, dbTable))
+
+def _ensure_shape(dbFileName: str, dbTable: str, data: Dict[str, Any]) -> None:
+    """Initialize the database only when data introduces columns not yet known to exist."""
+    if not frozenset(data) <= known_shapes.get((dbFileName, dbTable), frozenset()):
+        initialize_database(dbFileName, dbTable, data)
+
+def get_conn(dbFileName: str, readonly: bool = False) -> sqlite3.Connection:
+    """Get the calling thread's cached connection, opening the db if needed.
+
+    Readers ask for a separate read-only connection; with WAL journaling
+    they then never wait on (or block) the writer connection.
+    """
+    conns = getattr(_tls, 'conns', None)
+    if conns is None:
+        conns = _tls.conns = {}
+    cache_key = (dbFileName, readonly)
+    conn = conns.get(cache_key)
     if conn is None:
-        conn = sqlite3.connect(dbFileName)
+        if readonly:
+            try:
+                conn = sqlite3.connect(f"file:{dbFileName}?mode=ro", uri=True,
+                                       cached_statements=256)
+            except sqlite3.OperationalError:
+                # Database file doesn't exist yet; share the read-write
+                # connection, which creates it
+                return get_conn(dbFileName)
+        else:
+            conn = sqlite3.connect(dbFileName, cached_statements=256)
         conn.row_factory = sqlite3.Row
-        db_connection_cache[cache_key] = conn
+        # Tune the connection once on open: WAL journaling turns each
+        # autocommit from an fsync-per-insert into a sequential WAL append
+        # and lets readers run concurrently with the writer.
+        cursor = conn.cursor()
+        if not readonly:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+        conns[cache_key] = conn
     return conn
 
+def _write_cursor(dbFileName: str) -> sqlite3.Cursor:
+    """Get the calling thread's reusable write cursor for a database.
+
+    writeDB/writeDBMany previously created and closed a cursor per call;
+    reusing one saves that C-boundary allocation on every write. Read paths
+    keep private cursors since they hold result sets across calls.
+    """
+    cursors = getattr(_tls, 'write_cursors', None)
+    if cursors is None:
+        cursors = _tls.write_cursors = {}
+    cursor = cursors.get(dbFileName)
+    if cursor is None:
+        cursor = cursors[dbFileName] = get_conn(dbFileName).cursor()
+    return cursor
+
 def get_table_schema(dbFileName: str, dbTable: str) -> list:
     """
     Get the schema of the specified table from the database.
@@ -365,8 +756,10 @@ def get_table_schema(dbFileName: str, dbTable: str) -> list:
     # If not cached, retrieve the schema from the database
     conn = get_conn(dbFileName)
     cursor = conn.cursor()
-    cursor.execute(f"PRAGMA table_info({dbTable})")
-    schema = [row[1] for row in cursor.fetchall()]  # Get column names
+    # Parameter binding keeps the statement text stable so SQLite can reuse
+    # the prepared statement across tables
+    cursor.execute("SELECT name FROM pragma_table_info(?)", (dbTable,))
+    schema = [row[0] for row in cursor.fetchall()]  # Get column names
 
     # Cache the schema
     schema_cache[cache_key] = schema
@@ -380,6 +773,9 @@ def update_schema(dbFileName: str, dbTable: str, data: Dict[str, Any]) -> None:
     # Get the schema for the specified table
     columns = get_table_schema(dbFileName, dbTable)
 
+    # Collect the missing columns first so all ALTERs share one transaction
+    # (one disk sync) instead of autocommitting individually
+    missing = []
     for key, value in data.items():
         if key not in columns:
             if isinstance(value, int):
@@ -388,12 +784,31 @@ def update_schema(dbFileName: str, dbTable: str, data: Dict[str, Any]) -> None:
                 column_type = 'REAL'
             else:
                 column_type = 'TEXT'
-            cursor.execute(f"ALTER TABLE {dbTable} ADD COLUMN {key} {column_type} DEFAULT NULL")
-            #invalidate cached schema
-            cache_key = (dbFileName, dbTable)
-            #print(f"cache_key: {cache_key}")
-            if cache_key in schema_cache:
-                schema_cache.pop(cache_key)
+            missing.append((key, column_type))
+
+    if missing:
+        try:
+            cursor.execute("BEGIN")
+            for key, column_type in missing:
+                try:
+                    cursor.execute(f"ALTER TABLE {_q(dbTable)} ADD COLUMN {_q(key)} {column_type} DEFAULT NULL")
+                except sqlite3.OperationalError as e:
+                    # A concurrent writer beat us to this column; the schema
+                    # ends up the same either way
+                    if 'duplicate column name' not in str(e):
+                        raise
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        # Extend the cached schema in place instead of invalidating it,
+        # so the next write doesn't have to re-query table_info
+        cache_key = (dbFileName, dbTable)
+        if cache_key in schema_cache:
+            schema_cache[cache_key].extend(key for key, _ in missing)
+        # The cached last row no longer covers the full column set; drop it
+        # so the next cumulative write re-reads instead of hitting KeyError
+        last_row_cache.pop(cache_key, None)
     cursor.close()
     # TODO: Account for user data type overrides
 
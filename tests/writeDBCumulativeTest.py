@@ -0,0 +1,68 @@
+import os
+import sqlite3
+from dictionaryDB import *
+from dictionaryDB import last_row_cache
+
+# Define the test database file name and table name
+test_db_file = "writeDBCumulativeTest.db"
+test_table_name = "counters"
+
+# Delete the existing test database file (and WAL sidecars) if present
+for suffix in ("", "-wal", "-shm"):
+    if os.path.exists(test_db_file + suffix):
+        os.remove(test_db_file + suffix)
+
+# Counter samples from a source that resets: 5, 7, then the source restarts
+# and reports 2, 3. Totals must keep climbing across the reset.
+writeDB(test_db_file, test_table_name, {"bytes": 5}, cumulative_fields=["bytes"])
+writeDB(test_db_file, test_table_name, {"bytes": 7}, cumulative_fields=["bytes"])
+writeDB(test_db_file, test_table_name, {"bytes": 2}, cumulative_fields=["bytes"])  # Reset detected here
+writeDB(test_db_file, test_table_name, {"bytes": 3}, cumulative_fields=["bytes"])
+
+# Simulate a process restart: clear the in-process cache so the next write
+# has to reload totals and offsets from the database
+last_row_cache.clear()
+writeDB(test_db_file, test_table_name, {"bytes": 4}, cumulative_fields=["bytes"])
+
+print("Test data written to the database successfully.")
+
+# Function to read all records from the database
+def read_all_records(db_file: str, table_name: str):
+    conn = sqlite3.connect(db_file)
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT * FROM {table_name} ORDER BY id")
+    records = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return records
+
+# Check the running totals: the reset rebaselines at the old total of 7
+records = read_all_records(test_db_file, test_table_name)
+expected_records = [
+    (1, 5),
+    (2, 7),
+    (3, 9),   # 2 + offset 7
+    (4, 10),  # 3 + offset 7
+    (5, 11),  # 4 + offset 7, after the cache was cleared
+]
+
+if records == expected_records:
+    print("Records match expected values.")
+else:
+    print("Records do not match expected values.")
+    print("Expected:", expected_records)
+    print("Actual  :", records)
+
+# Check the offsets table: the UPSERT keeps exactly one row, holding the
+# baseline captured at the reset
+offsets = read_all_records(test_db_file, test_table_name + "offsets")
+expected_offsets = [
+    (1, 7),
+]
+
+if offsets == expected_offsets:
+    print("Offsets match expected values.")
+else:
+    print("Offsets do not match expected values.")
+    print("Expected:", expected_offsets)
+    print("Actual  :", offsets)
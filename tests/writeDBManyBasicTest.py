@@ -0,0 +1,78 @@
+import os
+import sqlite3
+from dictionaryDB import *
+
+# Define the test database file name and table name
+test_db_file = "writeDBManyBasicTest.db"
+test_table_name = "data"
+
+# Delete the existing test database file (and WAL sidecars) if present
+for suffix in ("", "-wal", "-shm"):
+    if os.path.exists(test_db_file + suffix):
+        os.remove(test_db_file + suffix)
+
+# Prepare test data: mixed shapes, so missing fields must be stored as NULL
+test_rows = [
+    {"temperature": 22.5, "humidity": 60},
+    {"temperature": 23.0},                 # No humidity
+    {"humidity": 65, "steps": 1500},       # New field, no temperature
+]
+
+# Write all rows in one call / one transaction
+writeDBMany(test_db_file, test_table_name, test_rows)
+
+# Write enough rows to force multiple multi-row VALUES chunks
+# (3 columns, so a chunk holds at most SQLITE_MAX_VARS // 3 rows)
+bulk_rows = [{"temperature": float(i), "humidity": i, "steps": i * 2} for i in range(12000)]
+writeDBMany(test_db_file, test_table_name, bulk_rows)
+
+print("Test data written to the database successfully.")
+
+# Function to read all records from the database
+def read_all_records(db_file: str, table_name: str):
+    conn = sqlite3.connect(db_file)
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT * FROM {table_name} ORDER BY id")
+    records = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return records
+
+records = read_all_records(test_db_file, test_table_name)
+
+# Check the row count: 3 mixed-shape rows plus 12000 bulk rows
+expected_count = 3 + 12000
+if len(records) == expected_count:
+    print("Record count matches expected value.")
+else:
+    print("Record count does not match expected value.")
+    print("Expected:", expected_count)
+    print("Actual  :", len(records))
+
+# Check the mixed-shape rows: missing fields must come back as NULL
+# (columns are created in first-seen order: temperature, humidity, steps)
+expected_records = [
+    (1, 22.5, 60, None),      # First row with temperature and humidity
+    (2, 23.0, None, None),    # Second row, humidity missing
+    (3, None, 65, 1500),      # Third row, temperature missing
+]
+
+if records[:3] == expected_records:
+    print("Records match expected values.")
+else:
+    print("Records do not match expected values.")
+    print("Expected:", expected_records)
+    print("Actual  :", records[:3])
+
+# Spot-check the first and last bulk rows survived the chunked inserts
+expected_bulk = [
+    (4, 0.0, 0, 0),
+    (expected_count, 11999.0, 11999, 23998),
+]
+
+if [records[3], records[-1]] == expected_bulk:
+    print("Bulk records match expected values.")
+else:
+    print("Bulk records do not match expected values.")
+    print("Expected:", expected_bulk)
+    print("Actual  :", [records[3], records[-1]])